@@ -0,0 +1,53 @@
+import argparse
+import os
+
+from utils.blob_store import BlobStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# main.py saves into downloads/, worker.py into library/ by default
+DEFAULT_LIBRARIES = [os.path.join(BASE_DIR, 'downloads'), os.path.join(BASE_DIR, 'library')]
+
+
+def format_size(num_bytes):
+    for unit in ['B', 'KB', 'MB']:
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subtitle library blob store maintenance")
+    parser.add_argument('--library', action='append', dest='libraries',
+                        help="Library directory containing .blobs (repeatable, default: downloads and library)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help="Show dedupe statistics")
+    gc = commands.add_parser('gc', help="Delete blobs no library file links to")
+    gc.add_argument('--dry-run', action='store_true')
+
+    args = parser.parse_args()
+    libraries = args.libraries or DEFAULT_LIBRARIES
+
+    for library in libraries:
+        blobs_dir = os.path.join(library, '.blobs')
+        if not os.path.isdir(blobs_dir):
+            if args.libraries:
+                print(f"❌ No blob store in {library}")
+            continue
+        store = BlobStore(blobs_dir)
+        print(f"{os.path.abspath(library)}{' (copy mode)' if store.copy_mode else ''}")
+
+        if args.command == 'stats':
+            stats = store.stats()
+            print(f"  Blobs: {stats['blobs']} ({format_size(stats['stored_bytes'])})")
+            print(f"  Library links: {stats['links']}")
+            print(f"  Unreferenced blobs: {stats['unreferenced']}")
+            print(f"  Saved by dedupe: {format_size(stats['saved_bytes'])}")
+        elif args.command == 'gc':
+            removed, freed = store.gc(dry_run=args.dry_run)
+            action = "Would remove" if args.dry_run else "Removed"
+            print(f"  ✓ {action} {removed} blobs ({format_size(freed)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from .base_page import BasePage
 from utils.file_handler import rename_subtitle_file
+from utils.blob_store import BlobStore
 from tqdm import tqdm
 import time
 import re
@@ -31,15 +32,21 @@ class SubtitlePage(BasePage):
     SUBTITLE_NAME = (By.CSS_SELECTOR, "td.ltr.text-right div")
     ERROR_MESSAGE = (By.XPATH, "//div[contains(text(), 'ההורדה נכשלה')]")
 
-    def __init__(self, driver):
+    def __init__(self, driver, downloads_dir=None, library_dir=None):
         super().__init__(driver)
         self.wait = WebDriverWait(driver, 10)
         self.series_name = None
         
         # Create downloads directory using absolute path
-        self.downloads_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'downloads'))
+        if downloads_dir is None:
+            downloads_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'downloads')
+        self.downloads_dir = os.path.abspath(downloads_dir)
         os.makedirs(self.downloads_dir, exist_ok=True)
         print(f"Downloads directory: {self.downloads_dir}")
+        
+        # Library files are hardlinks into a content-addressed blob store
+        self.library_dir = os.path.abspath(library_dir) if library_dir else self.downloads_dir
+        self.blob_store = BlobStore(os.path.join(self.library_dir, '.blobs'))
 
     def login(self, email, password):
         """Login to Ktuvit.me"""
@@ -337,7 +344,9 @@ class SubtitlePage(BasePage):
                     season=season_num,
                     episode=episode_num,
                     max_retries=2,
-                    retry_interval=2
+                    retry_interval=2,
+                    library_dir=self.library_dir,
+                    store=self.blob_store
                 )
                 
                 if success:
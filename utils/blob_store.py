@@ -0,0 +1,180 @@
+import os
+import errno
+import hashlib
+import shutil
+import socket
+import time
+import uuid
+
+# Blobs changed more recently than this are never collected, so a blob
+# that is being added and linked can't be deleted underneath the worker
+GC_GRACE_SECONDS = 3600
+
+# Created in the store once hardlinking has failed and library files are copies
+COPY_MODE_MARKER = '.copy-mode'
+
+
+class BlobStore:
+    """
+    Content-addressed store for subtitle files.
+
+    Files are kept once under blobs/<hash[:2]>/<hash> and library paths are
+    hardlinks to them, so identical subtitles across releases and re-syncs
+    share one copy on disk. Blobs are hash-checked before reuse, so a library
+    file edited in place is never mistaken for the stored content.
+
+    On filesystems without hardlinks library files are copies. The store then
+    switches to copy mode and finds references by hashing the library files
+    instead of relying on link counts.
+    """
+
+    def __init__(self, root, library_dir=None):
+        self.root = os.path.abspath(root)
+        self.library_dir = os.path.abspath(library_dir) if library_dir else os.path.dirname(self.root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    @property
+    def copy_mode(self):
+        return os.path.exists(os.path.join(self.root, COPY_MODE_MARKER))
+
+    @staticmethod
+    def hash_file(file_path):
+        """Return the SHA-256 hex digest of a file."""
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def _link_or_copy(self, src, dst):
+        try:
+            os.link(src, dst)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP):
+                raise
+            # Filesystem without hardlink support, fall back to a copy
+            shutil.copyfile(src, dst)
+            if not self.copy_mode:
+                open(os.path.join(self.root, COPY_MODE_MARKER), 'w').close()
+
+    def _store_blob(self, file_path, digest):
+        """Atomically make file_path the blob for digest."""
+        blob = self.blob_path(digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        tmp_path = f"{blob}.{uuid.uuid4().hex}.tmp"
+        self._link_or_copy(file_path, tmp_path)
+        try:
+            os.replace(tmp_path, blob)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    def _is_intact(self, digest):
+        blob = self.blob_path(digest)
+        return os.path.exists(blob) and self.hash_file(blob) == digest
+
+    def add(self, file_path, target_path):
+        """
+        Store a downloaded file, point target_path at its blob and return
+        the digest. The downloaded file is only removed once the target is
+        linked, so nothing is lost if linking fails.
+        """
+        digest = self.hash_file(file_path)
+        if not self._is_intact(digest):
+            self._store_blob(file_path, digest)
+        try:
+            self.link(digest, target_path)
+        except FileNotFoundError:
+            # The blob was collected between the check and the link
+            self._store_blob(file_path, digest)
+            self.link(digest, target_path)
+        os.remove(file_path)
+        return digest
+
+    def link(self, digest, target_path):
+        """
+        Point target_path at a blob. Does nothing if it already does or
+        already has the same content; otherwise the target is replaced
+        atomically. Returns True if the target was changed.
+        """
+        blob = self.blob_path(digest)
+        if os.path.exists(target_path):
+            if os.path.samefile(blob, target_path):
+                return False
+            # A copy (or an older link) with the same content needs no write
+            if self.copy_mode and self.hash_file(target_path) == digest:
+                return False
+
+        tmp_path = f"{target_path}.{socket.gethostname()}.{uuid.uuid4().hex}.tmp"
+        self._link_or_copy(blob, tmp_path)
+        try:
+            os.replace(tmp_path, target_path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+        return True
+
+    def _blobs(self):
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if name.endswith('.tmp'):
+                    continue
+                yield os.path.join(prefix_dir, name)
+
+    def _library_references(self):
+        """Count library files per content hash (used in copy mode)."""
+        references = {}
+        for dirpath, dirnames, filenames in os.walk(self.library_dir):
+            # Skip the store itself and hidden dirs such as worker staging
+            dirnames[:] = [d for d in dirnames
+                           if not d.startswith('.') and os.path.join(dirpath, d) != self.root]
+            for name in filenames:
+                if name.lower().endswith('.srt'):
+                    digest = self.hash_file(os.path.join(dirpath, name))
+                    references[digest] = references.get(digest, 0) + 1
+        return references
+
+    def _link_counts(self):
+        """Yield (blob, stat, number of library files using it)."""
+        references = self._library_references() if self.copy_mode else None
+        for blob in self._blobs():
+            st = os.stat(blob)
+            if references is None:
+                yield blob, st, st.st_nlink - 1
+            else:
+                yield blob, st, references.get(os.path.basename(blob), 0)
+
+    def stats(self):
+        """Return dedupe statistics for the store."""
+        stats = {'blobs': 0, 'links': 0, 'unreferenced': 0, 'stored_bytes': 0, 'saved_bytes': 0}
+        copy_mode = self.copy_mode
+        for blob, st, links in self._link_counts():
+            stats['blobs'] += 1
+            stats['links'] += links
+            stats['stored_bytes'] += st.st_size
+            if links == 0:
+                stats['unreferenced'] += 1
+            elif not copy_mode:
+                # Copies take their own space, only hardlinks save any
+                stats['saved_bytes'] += st.st_size * (links - 1)
+        return stats
+
+    def gc(self, dry_run=False, grace_seconds=GC_GRACE_SECONDS):
+        """Delete blobs that no library file uses. Returns (count, bytes)."""
+        removed = 0
+        freed = 0
+        cutoff = time.time() - grace_seconds
+        for blob, st, links in self._link_counts():
+            if links > 0 or max(st.st_mtime, st.st_ctime) > cutoff:
+                continue
+            if not dry_run:
+                os.remove(blob)
+            removed += 1
+            freed += st.st_size
+        return removed, freed
@@ -4,7 +4,7 @@ from selenium.webdriver.chrome.options import Options
 import os
 
 
-def create_driver():
+def create_driver(downloads_dir=None):
     """Create and configure Chrome WebDriver."""
     options = Options()
     
@@ -30,7 +30,9 @@ def create_driver():
     options.add_argument('--disable-notifications')
     
     # Set download directory
-    downloads_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'downloads'))
+    if downloads_dir is None:
+        downloads_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'downloads')
+    downloads_dir = os.path.abspath(downloads_dir)
     os.makedirs(downloads_dir, exist_ok=True)
     
     prefs = {
@@ -2,6 +2,7 @@ import os
 import glob
 import time
 from pathlib import Path
+from utils.blob_store import BlobStore
 
 def get_latest_file(directory):
     """Get the most recently created/modified file in the directory."""
@@ -39,11 +40,17 @@ def is_valid_subtitle_file(file_path):
     
     return True
 
-def rename_subtitle_file(downloads_dir, show_name, season, episode, max_retries=3, retry_interval=3):
+def rename_subtitle_file(downloads_dir, show_name, season, episode, max_retries=3, retry_interval=3,
+                         library_dir=None, store=None):
     """
-    Find the latest downloaded file and rename it to match the episode format.
+    Find the latest downloaded file, add it to the blob store and link it
+    into the library under the episode format name.
     Includes validation and retry logic.
     """
+    if library_dir is None:
+        library_dir = downloads_dir
+    if store is None:
+        store = BlobStore(os.path.join(library_dir, '.blobs'))
     attempt = 0
     initial_file_list = set(os.listdir(downloads_dir))
     
@@ -83,20 +90,20 @@ def rename_subtitle_file(downloads_dir, show_name, season, episode, max_retries=
             
         # Format the new filename
         new_filename = f"{show_name}.S{season:02d}E{episode:02d}.srt"
-        new_path = os.path.join(downloads_dir, new_filename)
+        new_path = os.path.join(library_dir, new_filename)
         
         try:
-            # If target file already exists, remove it
-            if os.path.exists(new_path):
-                os.remove(new_path)
-            
-            os.rename(latest_file, new_path)
+            # Unchanged content leaves the existing library file untouched
+            store.add(latest_file, new_path)
             
             # Final validation
             if os.path.exists(new_path) and is_valid_subtitle_file(new_path):
                 return True, new_filename
                 
-        except:
+        except OSError as e:
+            # The download is kept, so the next attempt picks it up again
+            print(f"\nError storing {new_filename}: {str(e)}")
+            time.sleep(retry_interval)
             continue
             
         time.sleep(retry_interval)
@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+DEAD = 'dead'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    episode INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires REAL,
+    result TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (url, season, episode)
+);
+CREATE INDEX IF NOT EXISTS jobs_status_lease ON jobs (status, lease_expires);
+"""
+
+
+class JobQueue:
+    """
+    Durable episode job queue backed by a SQLite file.
+
+    Workers claim a job under a time-limited lease and must heartbeat to keep
+    it. A job whose lease expires (e.g. the worker was killed) becomes
+    claimable again; once it has used up max_attempts it is dead-lettered.
+    """
+
+    def __init__(self, db_path, lease_seconds=120, max_attempts=3):
+        self.db_path = os.path.abspath(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Open a short-lived connection holding the write lock until commit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            # BEGIN itself may have failed (e.g. database is locked)
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def enqueue(self, url, season, episode):
+        """Add an episode job. Returns False if the job is already queued."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (url, season, episode, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, season, episode, now, now)
+            )
+            return cursor.rowcount == 1
+
+    def claim(self, worker_id):
+        """Lease the next available job to worker_id, or return None."""
+        now = time.time()
+        with self._transaction() as conn:
+            # Expired leases that have no attempts left go to the dead letter
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires = NULL, "
+                "last_error = COALESCE(last_error, 'Lease expired'), updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (DEAD, now, LEASED, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1",
+                (PENDING, LEASED, now)
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (LEASED, worker_id, now + self.lease_seconds, now, row['id'])
+            )
+            job = dict(row)
+            job['attempts'] += 1
+            return job
+
+    def heartbeat(self, job_id, worker_id):
+        """Extend the lease. Returns False if the worker no longer owns the job."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (now + self.lease_seconds, now, job_id, worker_id, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result=None):
+        """Mark a leased job as done. Returns False if the lease was lost."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (DONE, result, now, job_id, worker_id, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """Release a failed job for retry, or dead-letter it when out of attempts."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "worker_id = NULL, lease_expires = NULL, last_error = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (self.max_attempts, DEAD, PENDING, error, now, job_id, worker_id, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def requeue_dead(self):
+        """Move all dead-lettered jobs back to pending with fresh attempts."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, worker_id = NULL, lease_expires = NULL, "
+                "result = NULL, last_error = NULL, updated_at = ? WHERE status = ?",
+                (PENDING, now, DEAD)
+            )
+            return cursor.rowcount
+
+    def dead_jobs(self):
+        """Return all dead-lettered jobs."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY id", (DEAD,)
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    def stats(self):
+        """Return job counts per status."""
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        with self._transaction() as conn:
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[row['status']] = row['n']
+        return counts
@@ -0,0 +1,259 @@
+import argparse
+import os
+import shutil
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+from utils.job_queue import JobQueue
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Kept out of downloads/, where main.py deletes any file it doesn't recognise
+DEFAULT_QUEUE = os.path.join(BASE_DIR, 'jobs.sqlite3')
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'library')
+
+
+class SubtitleJobHandler:
+    """Runs episode jobs through SubtitlePage, reusing one logged-in browser."""
+
+    def __init__(self, worker_id, output_dir):
+        self.output_dir = os.path.abspath(output_dir)
+        # Each worker downloads into its own directory so that concurrent
+        # workers on one machine don't pick up each other's files
+        self.staging_dir = os.path.join(self.output_dir, '.staging', worker_id)
+        self.driver = None
+        self.page = None
+        self.logged_in = False
+        self.current_url = None
+        self.current_season = None
+
+    def _start(self):
+        # Selenium is only needed by workers that actually download
+        from utils.driver_factory import create_driver
+        from pages.subtitle_page import SubtitlePage
+
+        self.driver = create_driver(self.staging_dir)
+        self.page = SubtitlePage(self.driver, self.staging_dir, self.output_dir)
+        self.logged_in = False
+        self.current_url = None
+        self.current_season = None
+
+    def reset(self):
+        """Drop the browser and staged downloads so the next job starts clean."""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = None
+        self.page = None
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+    def __call__(self, job):
+        from config import KTUVIT_EMAIL, KTUVIT_PASSWORD
+
+        if self.driver is None:
+            self._start()
+
+        if job['url'] != self.current_url:
+            if self.logged_in:
+                ok = self.page.navigate_to(job['url'])
+            else:
+                ok = self.page.navigate_to(job['url'], KTUVIT_EMAIL, KTUVIT_PASSWORD)
+            if not ok:
+                raise RuntimeError("Access failed")
+            self.logged_in = True
+            self.current_url = job['url']
+            self.current_season = None
+            self.page.series_name = None
+
+        if job['season'] != self.current_season:
+            if not self.page.select_season(job['season']):
+                raise RuntimeError("Season selection failed")
+            self.current_season = job['season']
+
+        if not self.page.select_episode(job['episode']):
+            raise RuntimeError("Episode selection failed")
+
+        if not self.page.download_first_subtitle(job['season'], job['episode'], 0, 1):
+            raise RuntimeError("Download failed")
+        sys.stdout.write("\n")
+        return f"{self.page.series_name}.S{job['season']:02d}E{job['episode']:02d}.srt"
+
+
+class SimulatedJobHandler:
+    """Sleeps instead of downloading, for testing the queue with local processes."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def reset(self):
+        pass
+
+    def __call__(self, job):
+        time.sleep(self.seconds)
+        return f"simulated.S{job['season']:02d}E{job['episode']:02d}.srt"
+
+
+class Heartbeat(threading.Thread):
+    """Keeps a job's lease alive while the worker is busy with it."""
+
+    def __init__(self, queue, job_id, worker_id):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = max(queue.lease_seconds / 3, 1)
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.job_id, self.worker_id):
+                    self.lost = True
+                    return
+            except Exception as e:
+                print(f"Heartbeat error: {str(e)}")
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_worker(queue, handler, worker_id, poll_interval=5, exit_when_empty=False):
+    """Claim and run jobs until the queue is drained (or forever)."""
+    processed = 0
+    try:
+        while True:
+            try:
+                job = queue.claim(worker_id)
+            except sqlite3.Error as e:
+                print(f"[{worker_id}] Queue error: {str(e)}")
+                time.sleep(poll_interval)
+                continue
+            if job is None:
+                if exit_when_empty:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            label = f"S{job['season']:02d}E{job['episode']:02d} (job {job['id']}, attempt {job['attempts']})"
+            print(f"[{worker_id}] Claimed {label}")
+
+            heartbeat = Heartbeat(queue, job['id'], worker_id)
+            heartbeat.start()
+            error = None
+            try:
+                result = handler(job)
+            except Exception as e:
+                handler.reset()
+                error = str(e)
+            heartbeat.stop()
+
+            if heartbeat.lost:
+                # Another worker owns the job now, leave reporting to it
+                print(f"[{worker_id}] Lease lost for {label}, result discarded")
+                continue
+
+            # If reporting fails the lease expires and the job is retried
+            try:
+                if error is not None:
+                    queue.fail(job['id'], worker_id, error)
+                    print(f"[{worker_id}] ❌ {label}: {error}")
+                elif queue.complete(job['id'], worker_id, result):
+                    processed += 1
+                    print(f"[{worker_id}] ✓ {label}: {result}")
+                else:
+                    print(f"[{worker_id}] Lease lost for {label}, result discarded")
+            except sqlite3.Error as e:
+                print(f"[{worker_id}] Queue error reporting {label}: {str(e)}")
+                time.sleep(poll_interval)
+    finally:
+        handler.reset()
+    return processed
+
+
+def parse_episodes(values):
+    """Parse episode arguments such as '3' or '1-10'."""
+    episodes = []
+    for value in values:
+        if '-' in value:
+            start, end = value.split('-', 1)
+            episodes.extend(range(int(start), int(end) + 1))
+        else:
+            episodes.append(int(value))
+    return episodes
+
+
+def scrape_episodes(url, season):
+    """List the episode numbers of a season from the show page."""
+    import re
+    from utils.driver_factory import create_driver
+    from pages.subtitle_page import SubtitlePage
+    from config import KTUVIT_EMAIL, KTUVIT_PASSWORD
+
+    driver = create_driver()
+    try:
+        page = SubtitlePage(driver)
+        if not page.navigate_to(url, KTUVIT_EMAIL, KTUVIT_PASSWORD):
+            raise RuntimeError("Access failed")
+        if not page.select_season(season):
+            raise RuntimeError("Season selection failed")
+        return [int(re.search(r'\d+', e['episode_name']).group()) for e in page.get_episodes()]
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed Ktuvit subtitle download queue")
+    parser.add_argument('--queue', default=DEFAULT_QUEUE, help="Path to the SQLite queue (may be on shared storage)")
+    parser.add_argument('--lease', type=int, default=120, help="Lease length in seconds")
+    parser.add_argument('--max-attempts', type=int, default=3, help="Attempts before a job is dead-lettered")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help="Add episode jobs for a season")
+    enqueue.add_argument('url')
+    enqueue.add_argument('season', type=int)
+    enqueue.add_argument('episodes', nargs='*', help="Episode numbers or ranges (default: scrape the season)")
+
+    work = commands.add_parser('work', help="Claim and download jobs")
+    work.add_argument('--worker-id', default=f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}")
+    work.add_argument('--output-dir', default=DEFAULT_OUTPUT)
+    work.add_argument('--poll', type=float, default=5, help="Seconds between polls of an empty queue")
+    work.add_argument('--exit-when-empty', action='store_true')
+    work.add_argument('--simulate', type=float, metavar='SECONDS', help="Sleep instead of downloading")
+
+    commands.add_parser('stats', help="Show job counts")
+    commands.add_parser('dead', help="List dead-lettered jobs")
+    commands.add_parser('requeue-dead', help="Retry all dead-lettered jobs")
+
+    args = parser.parse_args()
+    queue = JobQueue(args.queue, lease_seconds=args.lease, max_attempts=args.max_attempts)
+
+    if args.command == 'enqueue':
+        episodes = parse_episodes(args.episodes) or scrape_episodes(args.url, args.season)
+        added = sum(queue.enqueue(args.url, args.season, episode) for episode in episodes)
+        print(f"✓ {added} jobs added ({len(episodes) - added} already queued)")
+    elif args.command == 'work':
+        if args.simulate is not None:
+            handler = SimulatedJobHandler(args.simulate)
+        else:
+            handler = SubtitleJobHandler(args.worker_id, args.output_dir)
+        processed = run_worker(queue, handler, args.worker_id, args.poll, args.exit_when_empty)
+        print(f"✓ {processed} jobs completed")
+    elif args.command == 'stats':
+        for status, count in queue.stats().items():
+            print(f"{status}: {count}")
+    elif args.command == 'dead':
+        for job in queue.dead_jobs():
+            print(f"{job['id']}: {job['url']} S{job['season']:02d}E{job['episode']:02d} - {job['last_error']}")
+    elif args.command == 'requeue-dead':
+        print(f"✓ {queue.requeue_dead()} jobs requeued")
+
+
+if __name__ == "__main__":
+    main()